@@ -55,6 +55,10 @@ class DSMetrics(db.Model):
 
 
 class DSMetaData(db.Model):
+    # Mirrors migration 005 so schemas built with db.create_all() also get the
+    # FULLTEXT index the explore search relies on
+    __table_args__ = (db.Index("ix_ds_meta_data_fulltext", "title", "description", "tags", mysql_prefix="FULLTEXT"),)
+
     id = db.Column(db.Integer, primary_key=True)
     deposition_id = db.Column(db.Integer)
     title = db.Column(db.String(120), nullable=False)
@@ -70,6 +74,9 @@ class DSMetaData(db.Model):
 
 
 class DataSet(db.Model):
+    # Mirrors migration 004 (newest/oldest explore sorting orders on created_at)
+    __table_args__ = (db.Index("ix_data_set_created_at", "created_at"),)
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
 
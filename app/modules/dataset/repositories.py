@@ -4,7 +4,7 @@ from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
 from flask_login import current_user
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, text
 
 from app.modules.dataset.models import Author, DataSet, DOIMapping, DSDownloadRecord, DSMetaData, DSViewRecord
 from core.repositories.BaseRepository import BaseRepository
@@ -112,6 +112,23 @@ class DataSetRepository(BaseRepository):
     def latest_synchronized(self):
         return self.model.query.join(DSMetaData).filter(DSMetaData.is_draft == 0).order_by(desc(self.model.id)).limit(5).all()
 
+    def get_homepage_stats(self) -> dict:
+        """Gather the homepage counters in a single round-trip instead of one query per counter."""
+        row = self.session.execute(
+            text(
+                "SELECT "
+                "(SELECT COUNT(*) FROM data_set ds"
+                " JOIN ds_meta_data dm ON ds.ds_meta_data_id = dm.id"
+                " WHERE dm.is_draft = 0) AS datasets_counter, "
+                "(SELECT COUNT(*) FROM mermaid_diagram) AS mermaid_diagrams_counter, "
+                "(SELECT COALESCE(MAX(id), 0) FROM ds_download_record) AS total_dataset_downloads, "
+                "(SELECT COALESCE(MAX(id), 0) FROM file_download_record) AS total_mermaid_diagram_downloads, "
+                "(SELECT COALESCE(MAX(id), 0) FROM ds_view_record) AS total_dataset_views, "
+                "(SELECT COALESCE(MAX(id), 0) FROM file_view_record) AS total_mermaid_diagram_views"
+            )
+        ).one()
+        return dict(row._mapping)
+
 
 class DOIMappingRepository(BaseRepository):
     def __init__(self):
@@ -147,6 +164,26 @@ class TrendingDatasetsRepository(BaseRepository):
 
         return results
 
+    def get_top_downloaded_dataset_ids(self, limit: int = 10, period_days: int = None) -> List[int]:
+        query = (
+            self.model.query.join(DSMetaData, DataSet.ds_meta_data_id == DSMetaData.id)
+            .join(DSDownloadRecord, DataSet.id == DSDownloadRecord.dataset_id)
+            .filter(DSMetaData.dataset_doi.isnot(None))  # Only synchronized datasets
+        )
+
+        if period_days is not None:
+            start_date = datetime.now(timezone.utc) - timedelta(days=period_days)
+            query = query.filter(DSDownloadRecord.download_date >= start_date)
+
+        return [
+            row[0]
+            for row in query.with_entities(DataSet.id)
+            .group_by(DataSet.id)
+            .order_by(desc(func.count(DSDownloadRecord.id)))
+            .limit(limit)
+            .all()
+        ]
+
     def get_top_downloaded_datasets_metadata(self, limit: int = 10, period_days: int = None) -> List[dict]:
         results = self.get_top_downloaded_datasets(limit=limit, period_days=period_days)
 
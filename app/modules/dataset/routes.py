@@ -6,7 +6,9 @@ import shutil
 import subprocess
 import tempfile
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+import zipfile
 from zipfile import ZipFile
 
 import requests
@@ -36,8 +38,42 @@ from app.modules.dataset.services import (
 )
 from app.modules.zenodo.services import FakenodoService
 
+try:
+    # Optional SIMD-accelerated DEFLATE for archive uploads; zipfile resolves its
+    # (de)compressors through this module-level zlib reference
+    from isal import isal_zlib
+
+    zipfile.zlib = isal_zlib
+except ImportError:
+    pass
+
 logger = logging.getLogger(__name__)
 
+# Keywords for mermaid diagram detection, compiled once instead of per upload request
+MERMAID_KEYWORDS = [
+    "graph",
+    "flowchart",
+    "sequenceDiagram",
+    "classDiagram",
+    "stateDiagram",
+    "pie",
+    "gantt",
+    "erDiagram",
+    "journey",
+    "gitGraph",
+    "gitgraph",
+    "c4",
+    "mindmap",
+    "timeline",
+    "sankey",
+    "radar",
+]
+MERMAID_KEYWORDS_RE = re.compile(r"^(?:" + "|".join(MERMAID_KEYWORDS) + r")\b", re.I)
+
+# Zip-bomb guard thresholds for ZIP uploads
+MAX_ZIP_UNCOMPRESSED_SIZE = 50 * 1024 * 1024
+MAX_ZIP_COMPRESSION_RATIO = 200
+
 
 dataset_service = DataSetService()
 author_service = AuthorService()
@@ -268,42 +304,15 @@ def upload():
     if not is_zip and not is_mmd:
         return jsonify({"message": "No valid file (must be .mmd or .zip)"}), 400
 
-    # Keywords for mermaid diagram detection
-    keywords = [
-        "graph",
-        "flowchart",
-        "sequenceDiagram",
-        "classDiagram",
-        "stateDiagram",
-        "pie",
-        "gantt",
-        "erDiagram",
-        "journey",
-        "gitGraph",
-        "gitgraph",
-        "c4",
-        "mindmap",
-        "timeline",
-        "sankey",
-        "radar",
-    ]
-    keywords_re = re.compile(r"^(?:" + "|".join(keywords) + r")\b", re.I)
-
-    def validate_mermaid_blocks(content):
-        """Extract and validate mermaid blocks. Returns list of blocks or error message."""
-        blocks = []
-        current = []
-        for line in content.splitlines():
-            if keywords_re.match(line.strip()):
-                if current:
-                    blocks.append("\n".join(current))
-                current = [line]
-            else:
-                if current:
-                    current.append(line)
-        if current:
-            blocks.append("\n".join(current))
-        return blocks
+    def count_mermaid_blocks(lines):
+        """Count mermaid diagram blocks from an iterable of lines without materializing the file."""
+        count = 0
+        for line in lines:
+            if MERMAID_KEYWORDS_RE.match(line.strip()):
+                count += 1
+                if count > 1:
+                    break  # callers only distinguish none / one / many
+        return count
 
     def validate_with_mmdc(file_path):
         """Optional: validate with mmdc if available. Returns error message or None."""
@@ -331,8 +340,8 @@ def upload():
             logger.exception("Exception while running mmdc validation")
             return f"mmdc validation error: {e}"
 
-    def save_file_unique(filename, content):
-        """Save file with collision avoidance. Returns new filename or None on error."""
+    def unique_filename(filename):
+        """Return a collision-free (filename, path) pair inside the temp folder."""
         file_path = os.path.join(temp_folder, filename)
         if os.path.exists(file_path):
             base_name, ext = os.path.splitext(filename)
@@ -343,6 +352,11 @@ def upload():
                 candidate = f"{base_name} ({i}){ext}"
             filename = candidate
             file_path = os.path.join(temp_folder, filename)
+        return filename, file_path
+
+    def save_file_unique(filename, content):
+        """Save file with collision avoidance. Returns new filename or None on error."""
+        filename, file_path = unique_filename(filename)
         try:
             with open(file_path, "w", encoding="utf-8") as fh:
                 fh.write(content)
@@ -351,6 +365,16 @@ def upload():
             logger.exception("Error saving file")
             return None
 
+    def store_file_unique(filename, src_path):
+        """Move an already-validated temp file into the temp folder with collision avoidance."""
+        filename, file_path = unique_filename(filename)
+        try:
+            shutil.move(src_path, file_path)
+            return filename
+        except Exception:
+            logger.exception("Error saving file")
+            return None
+
     # Handle single .mmd file
     if is_mmd:
         try:
@@ -358,10 +382,10 @@ def upload():
         except Exception:
             return jsonify({"message": "Could not decode file as UTF-8"}), 400
 
-        blocks = validate_mermaid_blocks(content)
+        blocks = count_mermaid_blocks(content.splitlines())
         if not blocks:
             return jsonify({"message": "No Mermaid diagram detected in the uploaded file"}), 400
-        if len(blocks) > 1:
+        if blocks > 1:
             return jsonify({"message": "Multiple Mermaid diagrams detected. Please upload one diagram per file."}), 400
 
         # Optional mmdc validation
@@ -401,58 +425,77 @@ def upload():
             # Extract and process each .mmd file
             try:
                 with ZipFile(zip_tmp.name, "r") as zip_ref:
-                    for member in zip_ref.namelist():
-                        # Skip non-.mmd files and directories
-                        if not member.lower().endswith(".mmd"):
-                            continue
-                        if member.endswith("/"):
-                            continue
-
+                    # Zip-bomb guard: cheap metadata check before decompressing anything
+                    infolist = zip_ref.infolist()
+                    total_size = sum(info.file_size for info in infolist)
+                    if total_size > MAX_ZIP_UNCOMPRESSED_SIZE or any(
+                        info.compress_size > 0 and info.file_size / info.compress_size > MAX_ZIP_COMPRESSION_RATIO
+                        for info in infolist
+                    ):
+                        return jsonify({"message": "ZIP rejected: uncompressed size or compression ratio too large"}), 400
+
+                    def validate_entry(member):
+                        """Validate one ZIP entry. Returns (member, tmp_path, reason); tmp_path is None on rejection."""
                         # Security: reject absolute paths and path traversal attempts
                         member_path = os.path.normpath(member)
                         if os.path.isabs(member_path) or ".." in member_path.split(os.sep):
-                            rejected_files.append({"member": member, "reason": "Security: invalid path"})
-                            continue
+                            return member, None, "Security: invalid path"
 
+                        # Spool the member to disk once with a bounded buffer instead of
+                        # reading the whole entry into memory
+                        tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mmd")
+                        reason = None
                         try:
-                            content = zip_ref.read(member).decode("utf-8")
+                            with zip_ref.open(member) as src:
+                                shutil.copyfileobj(src, tmp_file, length=32 * 1024)
+                            tmp_file.close()
+
+                            # Validate mermaid blocks line by line
+                            try:
+                                with open(tmp_file.name, encoding="utf-8") as fh:
+                                    blocks = count_mermaid_blocks(fh)
+                            except (UnicodeDecodeError, ValueError) as e:
+                                reason = f"Decode error: {e}"
+                            else:
+                                if not blocks:
+                                    reason = "No Mermaid diagram detected"
+                                elif blocks > 1:
+                                    reason = "Multiple Mermaid diagrams detected"
+                                else:
+                                    # Optional mmdc validation
+                                    reason = validate_with_mmdc(tmp_file.name)
                         except Exception as e:
-                            rejected_files.append({"member": member, "reason": f"Decode error: {e}"})
-                            continue
+                            reason = f"Decode error: {e}"
 
-                        # Validate mermaid blocks
-                        blocks = validate_mermaid_blocks(content)
-                        if not blocks:
-                            rejected_files.append({"member": member, "reason": "No Mermaid diagram detected"})
-                            continue
-                        if len(blocks) > 1:
-                            rejected_files.append({"member": member, "reason": "Multiple Mermaid diagrams detected"})
-                            continue
+                        if reason:
+                            try:
+                                os.remove(tmp_file.name)
+                            except Exception:
+                                pass
+                            return member, None, reason
+                        return member, tmp_file.name, None
 
-                        # Optional mmdc validation
-                        tmp_file = None
-                        try:
-                            tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mmd")
-                            tmp_file.write(content.encode("utf-8"))
-                            tmp_file.close()
-                            mmdc_err = validate_with_mmdc(tmp_file.name)
-                            if mmdc_err:
-                                rejected_files.append({"member": member, "reason": mmdc_err})
-                                continue
-                        finally:
-                            if tmp_file:
-                                try:
-                                    os.remove(tmp_file.name)
-                                except Exception:
-                                    pass
-
-                        # Save the file
-                        base_name = os.path.basename(member)
-                        saved_name = save_file_unique(base_name, content)
+                    members = [m for m in zip_ref.namelist() if m.lower().endswith(".mmd") and not m.endswith("/")]
+
+                    # Validate entries concurrently; decompression and mmdc runs overlap
+                    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+                        results = list(executor.map(validate_entry, members))
+
+                    # Naming and saving stay serial and in member order so duplicate
+                    # suffixes remain deterministic
+                    for member, tmp_path, reason in results:
+                        if reason:
+                            rejected_files.append({"member": member, "reason": reason})
+                            continue
+                        saved_name = store_file_unique(os.path.basename(member), tmp_path)
                         if saved_name:
                             accepted_files.append(saved_name)
                         else:
                             rejected_files.append({"member": member, "reason": "Could not save file"})
+                            try:
+                                os.remove(tmp_path)
+                            except Exception:
+                                pass
 
             finally:
                 try:
@@ -158,6 +158,9 @@ class DataSetService(BaseService):
     def count_unsynchronized_datasets_for_user(self, current_user_id: int) -> int:
         return self.repository.count_unsynchronized_datasets(current_user_id)
 
+    def get_homepage_stats(self) -> dict:
+        return self.repository.get_homepage_stats()
+
     def latest_synchronized(self):
         datasets = self.repository.latest_synchronized()
         for dataset in datasets:
@@ -435,6 +438,10 @@ class TrendingDatasetsService(BaseService):
         period_days = self._get_period_days(period)
         return self.repository.get_top_downloaded_datasets(limit=limit, period_days=period_days)
 
+    def get_trending_dataset_ids(self, limit: int = 10, period: str = "week") -> list:
+        period_days = self._get_period_days(period)
+        return self.repository.get_top_downloaded_dataset_ids(limit=limit, period_days=period_days)
+
     def get_trending_datasets_metadata(self, limit: int = 10, period: str = "week") -> list:
         period_days = self._get_period_days(period)
         return self.repository.get_top_downloaded_datasets_metadata(limit=limit, period_days=period_days)
@@ -6,6 +6,7 @@ import tempfile
 import uuid
 import zipfile
 from io import BytesIO
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 from zipfile import ZipFile
 
@@ -20,7 +21,7 @@ from app.modules.auth.models import User
 from app.modules.auth.services import AuthenticationService
 from app.modules.dataset.models import DiagramType
 from app.modules.dataset.repositories import DSDownloadRecordRepository
-from app.modules.dataset.routes import upload
+from app.modules.dataset.routes import MAX_ZIP_COMPRESSION_RATIO, upload
 from app.modules.dataset.services import (
     DataSetService,
     DOIMappingService,
@@ -48,6 +49,27 @@ def dataset_service():
     return service
 
 
+@pytest.fixture
+def ds_view_record_service():
+    service = DSViewRecordService()
+    service.repository = MagicMock()
+    return service
+
+
+@pytest.fixture
+def ds_download_record_service():
+    service = DSDownloadRecordService()
+    service.repository = MagicMock()
+    return service
+
+
+@pytest.fixture
+def doi_mapping_service():
+    service = DOIMappingService()
+    service.repository = MagicMock()
+    return service
+
+
 @pytest.fixture
 def test_user(tmp_path):
     class Profile:
@@ -69,6 +91,18 @@ def test_user(tmp_path):
     return User()
 
 
+# Defined once at module level; the old inline type("FileField", ...) call built
+# a throwaway class per instantiation
+class _TestMMD:
+    def __init__(self):
+        self.mmd_filename = SimpleNamespace(data="diagram.mmd")
+        self.get_mdmetadata = lambda: {"title": "Diagram"}
+        self.get_authors = lambda: [{"name": "Author", "affiliation": "Lab"}]
+
+    def __repr__(self):
+        return "<TestMMD>"
+
+
 @pytest.fixture
 def test_form(tmp_path):
     class TestForm:
@@ -85,30 +119,29 @@ def test_form(tmp_path):
 
         @property
         def mermaid_diagrams(self):
-            class TestMMD:
-                def __init__(self):
-                    self.mmd_filename = type("FileField", (), {"data": "diagram.mmd"})
-                    self.get_mdmetadata = lambda: {"title": "Diagram"}
-                    self.get_authors = lambda: [{"name": "Author", "affiliation": "Lab"}]
-
-                def __repr__(self):
-                    return "<TestMMD>"
-
-            return [TestMMD()]
+            return [_TestMMD()]
 
     with open(tmp_path / "diagram.mmd", "wb") as f:
         f.write(b"data")
     return TestForm()
 
 
-def test_calculate_checksum_and_size_creates_valid_sha256(tmp_path):
+@pytest.mark.parametrize(
+    "content, expected_checksum",
+    [
+        (b"", "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"),
+        (b"abc", "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"),
+        (b"a" * 1_000_000, "cdc76e5c9914fb9281a1c7e284d73e67f1809a48a497200e046d39ccc7112cd0"),
+    ],
+)
+def test_calculate_checksum_and_size_creates_valid_sha256(tmp_path, content, expected_checksum):
     file_path = tmp_path / "file.txt"
-    file_path.write_bytes(b"abc")
+    file_path.write_bytes(content)
 
     checksum, size = calculate_checksum_and_size(str(file_path))
 
-    assert checksum == "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
-    assert size == 3
+    assert checksum == expected_checksum
+    assert size == len(content)
 
 
 def test_size_service_readable_formats():
@@ -119,7 +152,7 @@ def test_size_service_readable_formats():
     assert s.get_human_readable_size(3 * 1024**3) == "3.0 GB"
 
 
-def test_move_mermaid_diagrams(dataset_service, test_user, tmp_path):
+def test_move_mermaid_diagrams(dataset_service, test_user, tmp_path, monkeypatch):
     dataset = MagicMock()
     dataset.mermaid_diagrams = [MagicMock(md_meta_data=MagicMock(mmd_filename="diagram1.mmd"))]
     src = test_user.temp_folder()
@@ -127,7 +160,8 @@ def test_move_mermaid_diagrams(dataset_service, test_user, tmp_path):
     with open(os.path.join(src, "diagram1.mmd"), "wb") as f:
         f.write(b"x")
 
-    with patch("shutil.move") as mock_move, patch.dict(os.environ, {"WORKING_DIR": str(tmp_path)}):
+    monkeypatch.setenv("WORKING_DIR", str(tmp_path))
+    with patch("shutil.move") as mock_move:
         dataset.id = 1
         with patch("app.modules.dataset.services.AuthenticationService") as MockAuth:
             MockAuth.return_value.get_authenticated_user.return_value = test_user
@@ -174,7 +208,6 @@ def test_create_from_form_success(dataset_service, test_form, test_user):
     ds_mock = MagicMock(id=1)
     dataset_service.create = MagicMock(return_value=ds_mock)
     dataset_service.dsmetadata_repository.create.return_value = MagicMock(id=99)
-    dataset_service.repository.session.commit = MagicMock()
 
     result = dataset_service.create_from_form(test_form, test_user)
     assert result == ds_mock
@@ -183,7 +216,6 @@ def test_create_from_form_success(dataset_service, test_form, test_user):
 
 def test_create_from_form_rollback_on_error(dataset_service, test_form, test_user):
     dataset_service.dsmetadata_repository.create.side_effect = Exception("Boom")
-    dataset_service.repository.session.rollback = MagicMock()
 
     with pytest.raises(Exception):
         dataset_service.create_from_form(test_form, test_user)
@@ -203,85 +235,66 @@ def test_get_mermaidhub_doi_with_flask_context(dataset_service):
         assert result == "http://domain/doi/12345"
 
 
-def test_get_mermaidhub_doi_fallback_to_domain(dataset_service):
+def test_get_mermaidhub_doi_fallback_to_domain(dataset_service, monkeypatch):
     dataset = MagicMock()
     dataset.ds_meta_data.dataset_doi = "99999"
-    with (
-        patch("app.modules.dataset.services.url_for", side_effect=Exception()),
-        patch.dict(os.environ, {"DOMAIN": "example.com"}),
-    ):
+    monkeypatch.setenv("DOMAIN", "example.com")
+    with patch("app.modules.dataset.services.url_for", side_effect=Exception()):
         result = dataset_service.get_mermaidhub_doi(dataset)
         assert result == "http://example.com/doi/99999"
 
 
-def test_create_cookie_creates_new_record(monkeypatch):
+def test_create_cookie_creates_new_record(ds_view_record_service, monkeypatch):
     test_dataset = MagicMock()
-    service = DSViewRecordService()
-    service.repository = MagicMock()
-    service.repository.the_record_exists.return_value = None
-    service.repository.create_new_record.return_value = "record"
+    ds_view_record_service.repository.the_record_exists.return_value = None
+    ds_view_record_service.repository.create_new_record.return_value = "record"
 
     test_cookie = str(uuid.uuid4())
     monkeypatch.setattr("app.modules.dataset.services.request", MagicMock(cookies={"view_cookie": test_cookie}))
 
-    result = service.create_cookie(test_dataset)
+    result = ds_view_record_service.create_cookie(test_dataset)
     assert isinstance(result, str)
-    service.repository.create_new_record.assert_called_once()
-
+    ds_view_record_service.repository.create_new_record.assert_called_once()
 
-def test_doi_mapping_get_new_doi_found():
-    s = DOIMappingService()
-    s.repository = MagicMock()
-    s.repository.get_new_doi.return_value = MagicMock(dataset_doi_new="new_doi")
-    assert s.get_new_doi("old") == "new_doi"
 
-
-def test_doi_mapping_get_new_doi_not_found():
-    s = DOIMappingService()
-    s.repository = MagicMock()
-    s.repository.get_new_doi.return_value = None
-    assert s.get_new_doi("old") is None
+@pytest.mark.parametrize("found", [True, False])
+def test_doi_mapping_get_new_doi(doi_mapping_service, found):
+    mapping = MagicMock(dataset_doi_new="new_doi") if found else None
+    doi_mapping_service.repository.get_new_doi.return_value = mapping
+    expected = "new_doi" if found else None
+    assert doi_mapping_service.get_new_doi("old") == expected
 
 
 # -- Download Count Tests --
 
 
-def test_dsdownloadrecord_service_get_download_count_zero():
+def test_dsdownloadrecord_service_get_download_count_zero(ds_download_record_service):
     """Test get_download_count returns 0 when no downloads exist"""
-    service = DSDownloadRecordService()
-    service.repository = MagicMock()
-
     with patch("app.modules.dataset.services.db.session.query") as mock_query:
         mock_query.return_value.filter.return_value.scalar.return_value = None
 
-        result = service.get_download_count(1)
+        result = ds_download_record_service.get_download_count(1)
 
         assert result == 0
 
 
-def test_dsdownloadrecord_service_get_download_count_with_downloads():
+def test_dsdownloadrecord_service_get_download_count_with_downloads(ds_download_record_service):
     """Test get_download_count returns correct count when downloads exist"""
-    service = DSDownloadRecordService()
-    service.repository = MagicMock()
-
     with patch("app.modules.dataset.services.db.session.query") as mock_query:
         mock_query.return_value.filter.return_value.scalar.return_value = 5
 
-        result = service.get_download_count(1)
+        result = ds_download_record_service.get_download_count(1)
 
         assert result == 5
 
 
-def test_dsdownloadrecord_service_get_download_count_large_number():
+def test_dsdownloadrecord_service_get_download_count_large_number(ds_download_record_service):
     """Test get_download_count handles large numbers correctly"""
-    service = DSDownloadRecordService()
-    service.repository = MagicMock()
-
     with patch("app.modules.dataset.services.db.session.query") as mock_query:
         mock_filter = mock_query.return_value.filter.return_value
         mock_filter.scalar.return_value = 999999
 
-        result = service.get_download_count(1)
+        result = ds_download_record_service.get_download_count(1)
 
         assert result == 999999
 
@@ -405,39 +418,55 @@ def test_client(test_client):
     yield test_client
 
 
+@pytest.fixture(scope="module")
+def login_url(test_client):
+    """Resolve the login URL once per module instead of calling url_for in every test."""
+    with test_client.application.test_request_context():
+        return url_for("auth.login")
+
+
+@pytest.fixture
+def mock_current_user(tmp_path):
+    """Patch the dataset routes' current_user with a mock backed by a temp folder."""
+    user = MagicMock(id=1, is_authenticated=True)
+    user.temp_folder = MagicMock(return_value=str(tmp_path))
+    with patch("app.modules.dataset.routes.current_user", user):
+        yield user
+
+
 # -- Simple authentication and data-validation tests --
 def test_upload_get_requires_login(test_client):
     """Test GET /dataset/upload requires authentication"""
     response = test_client.get("/dataset/upload")
     assert response.status_code == 302
-    assert "/login" in response.location
+    assert "/login" in response.headers.get("Location", "")
 
 
 def test_upload_post_requires_login(test_client):
     """Test POST /dataset/upload requires authentication"""
     response = test_client.post("/dataset/upload")
     assert response.status_code == 302
-    assert "/login" in response.location
+    assert "/login" in response.headers.get("Location", "")
 
 
 def test_list_dataset_requires_login(test_client):
     """Test GET /dataset/list requires authentication"""
     response = test_client.get("/dataset/list")
     assert response.status_code == 302
-    assert "/login" in response.location
+    assert "/login" in response.headers.get("Location", "")
 
 
 def test_file_upload_requires_login(test_client):
     """Test POST /dataset/file/upload requires authentication"""
     response = test_client.post("/dataset/file/upload")
     assert response.status_code == 302
-    assert "/login" in response.location
+    assert "/login" in response.headers.get("Location", "")
 
 
-def test_file_upload_no_file(test_client):
+def test_file_upload_no_file(test_client, login_url):
     """Test file upload without file returns 400"""
     response = test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
-    assert response.request.path != url_for("auth.login"), "Login was unsuccessful"
+    assert response.request.path != login_url, "Login was unsuccessful"
 
     response = test_client.post("/dataset/file/upload", data={})
     assert response.status_code == 400
@@ -445,10 +474,10 @@ def test_file_upload_no_file(test_client):
     test_client.get("/logout", follow_redirects=True)
 
 
-def test_file_upload_invalid_extension(test_client):
+def test_file_upload_invalid_extension(test_client, login_url):
     """Test file upload with invalid extension returns 400"""
     response = test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
-    assert response.request.path != url_for("auth.login"), "Login was unsuccessful"
+    assert response.request.path != login_url, "Login was unsuccessful"
 
     data = {"file": (BytesIO(b"content"), "test.txt")}
     response = test_client.post("/dataset/file/upload", data=data, content_type="multipart/form-data")
@@ -458,189 +487,134 @@ def test_file_upload_invalid_extension(test_client):
     test_client.get("/logout", follow_redirects=True)
 
 
-def test_file_upload_no_mermaid_content(test_client):
+def test_file_upload_no_mermaid_content(test_client, mock_current_user, login_url):
     """Test file upload with no mermaid diagram returns 400"""
     response = test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
-    assert response.request.path != url_for("auth.login"), "Login was unsuccessful"
+    assert response.request.path != login_url, "Login was unsuccessful"
 
-    temp_dir = tempfile.mkdtemp()
-
-    mock_user = MagicMock()
-    mock_user.temp_folder = MagicMock(return_value=temp_dir)
-    mock_user.id = 1
-    mock_user.is_authenticated = True
-
-    with patch("app.modules.dataset.routes.current_user", mock_user):
-        data = {"file": (BytesIO(b"invalid content"), "test.mmd")}
-        response = test_client.post("/dataset/file/upload", data=data, content_type="multipart/form-data")
+    data = {"file": (BytesIO(b"invalid content"), "test.mmd")}
+    response = test_client.post("/dataset/file/upload", data=data, content_type="multipart/form-data")
 
     assert response.status_code == 400
 
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-
     test_client.get("/logout", follow_redirects=True)
 
 
-def test_file_upload_multiple_diagrams(test_client):
+def test_file_upload_multiple_diagrams(test_client, mock_current_user, login_url):
     """Test file upload with multiple diagrams returns 400"""
     response = test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
-    assert response.request.path != url_for("auth.login"), "Login was unsuccessful"
+    assert response.request.path != login_url, "Login was unsuccessful"
 
-    temp_dir = tempfile.mkdtemp()
-
-    mock_user = MagicMock()
-    mock_user.temp_folder = MagicMock(return_value=temp_dir)
-    mock_user.id = 1
-    mock_user.is_authenticated = True
-
-    with patch("app.modules.dataset.routes.current_user", mock_user):
-        data = {"file": (BytesIO(b"graph TD\nA-->B\n\nflowchart LR\nC-->D"), "test.mmd")}
-        response = test_client.post("/dataset/file/upload", data=data, content_type="multipart/form-data")
+    data = {"file": (BytesIO(b"graph TD\nA-->B\n\nflowchart LR\nC-->D"), "test.mmd")}
+    response = test_client.post("/dataset/file/upload", data=data, content_type="multipart/form-data")
 
     assert response.status_code == 400
 
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-
     test_client.get("/logout", follow_redirects=True)
 
 
-def test_file_upload_valid_mermaid(test_client):
+def test_file_upload_valid_mermaid(test_client, mock_current_user, login_url):
     """Test file upload with valid mermaid diagram succeeds"""
     response = test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
-    assert response.request.path != url_for("auth.login"), "Login was unsuccessful"
-
-    temp_dir = tempfile.mkdtemp()
-
-    mock_user = MagicMock()
-    mock_user.temp_folder = MagicMock(return_value=temp_dir)
-    mock_user.id = 1
-    mock_user.is_authenticated = True
-
-    with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+    assert response.request.path != login_url, "Login was unsuccessful"
 
+    with patch("shutil.which", return_value=None):
         data = {"file": (BytesIO(b"graph TD\nA-->B"), "diagram.mmd")}
         response = test_client.post("/dataset/file/upload", data=data, content_type="multipart/form-data")
 
     assert response.status_code == 200
 
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-
     test_client.get("/logout", follow_redirects=True)
 
 
-def test_file_delete_nonexistent(test_client):
+def test_file_delete_nonexistent(test_client, mock_current_user, login_url):
     """Test deleting non-existent file returns error"""
     response = test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
-    assert response.request.path != url_for("auth.login"), "Login was unsuccessful"
+    assert response.request.path != login_url, "Login was unsuccessful"
 
-    temp_dir = tempfile.mkdtemp()
-
-    mock_user = MagicMock()
-    mock_user.temp_folder = MagicMock(return_value=temp_dir)
-    mock_user.id = 1
-    mock_user.is_authenticated = True
-
-    with patch("app.modules.dataset.routes.current_user", mock_user):
-        response = test_client.post("/dataset/file/delete", json={"file": "nonexistent.mmd"})
+    response = test_client.post("/dataset/file/delete", json={"file": "nonexistent.mmd"})
 
     assert response.status_code == 200
 
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-
     test_client.get("/logout", follow_redirects=True)
 
 
-def test_file_delete_success(test_client):
+def test_file_delete_success(test_client, mock_current_user, login_url):
     """Test deleting existing file succeeds"""
     response = test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
-    assert response.request.path != url_for("auth.login"), "Login was unsuccessful"
+    assert response.request.path != login_url, "Login was unsuccessful"
 
-    temp_dir = tempfile.mkdtemp()
-
-    test_file = os.path.join(temp_dir, "test.mmd")
+    test_file = os.path.join(mock_current_user.temp_folder(), "test.mmd")
     with open(test_file, "w") as f:
         f.write("graph TD\nA-->B")
 
-    mock_user = MagicMock()
-    mock_user.temp_folder = MagicMock(return_value=temp_dir)
-    mock_user.id = 1
-    mock_user.is_authenticated = True
-
-    with patch("app.modules.dataset.routes.current_user", mock_user):
-        response = test_client.post("/dataset/file/delete", json={"file": "test.mmd"})
+    response = test_client.post("/dataset/file/delete", json={"file": "test.mmd"})
 
     assert response.status_code == 200
     assert not os.path.exists(test_file)
 
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-
     test_client.get("/logout", follow_redirects=True)
 
 
-def test_doi_route_redirects_old_doi(test_client):
+@pytest.fixture
+def doi_patches():
+    """Patch the services used by the DOI route and yield the mocks."""
+    with (
+        patch("app.modules.dataset.routes.doi_mapping_service") as mock_doi,
+        patch("app.modules.dataset.routes.dsmetadata_service") as mock_ds,
+        patch("app.modules.dataset.routes.ds_view_record_service") as mock_view,
+    ):
+        yield {"doi": mock_doi, "ds": mock_ds, "view": mock_view}
+
+
+def test_doi_route_redirects_old_doi(test_client, doi_patches):
     """Test DOI route redirects old DOI to new DOI"""
-    with patch("app.modules.dataset.routes.doi_mapping_service") as mock_service:
-        mock_service.get_new_doi.return_value = "new_doi_123"
+    doi_patches["doi"].get_new_doi.return_value = "new_doi_123"
 
-        response = test_client.get("/doi/old_doi_123/", follow_redirects=False)
+    response = test_client.get("/doi/old_doi_123/", follow_redirects=False)
 
-        assert response.status_code == 302
-        assert "new_doi_123" in response.location
+    assert response.status_code == 302
+    assert "new_doi_123" in response.location
 
 
-def test_doi_route_not_found(test_client):
+def test_doi_route_not_found(test_client, doi_patches):
     """Test DOI route returns 404 for non-existent DOI"""
-    with (
-        patch("app.modules.dataset.routes.doi_mapping_service") as mock_doi,
-        patch("app.modules.dataset.routes.dsmetadata_service") as mock_ds,
-    ):
-        mock_doi.get_new_doi.return_value = None
-        mock_ds.filter_by_doi.return_value = None
+    doi_patches["doi"].get_new_doi.return_value = None
+    doi_patches["ds"].filter_by_doi.return_value = None
 
-        response = test_client.get("/doi/nonexistent/")
+    response = test_client.get("/doi/nonexistent/")
 
-        assert response.status_code == 404
+    assert response.status_code == 404
 
 
-def test_doi_route_renders_dataset(test_client):
+def test_doi_route_renders_dataset(test_client, doi_patches):
     """Test DOI route renders dataset page successfully"""
-    with (
-        patch("app.modules.dataset.routes.doi_mapping_service") as mock_doi,
-        patch("app.modules.dataset.routes.dsmetadata_service") as mock_ds,
-        patch("app.modules.dataset.routes.ds_view_record_service") as mock_view,
-    ):
-
-        mock_doi.get_new_doi.return_value = None
+    doi_patches["doi"].get_new_doi.return_value = None
 
-        mock_dataset = MagicMock()
-        mock_dataset.id = 1
+    mock_dataset = MagicMock()
+    mock_dataset.id = 1
 
-        mock_ds_meta = MagicMock()
-        mock_ds_meta.diagram_type = DiagramType.FLOWCHART
-        mock_ds_meta.tags = "tagA, tagB"
-        mock_ds_meta.authors = []
-        mock_ds_meta.is_draft = 0
+    mock_ds_meta = MagicMock()
+    mock_ds_meta.diagram_type = DiagramType.FLOWCHART
+    mock_ds_meta.tags = "tagA, tagB"
+    mock_ds_meta.authors = []
+    mock_ds_meta.is_draft = 0
 
-        mock_dataset.ds_meta_data = mock_ds_meta
+    mock_dataset.ds_meta_data = mock_ds_meta
 
-        mock_ds.filter_by_doi.return_value = MagicMock(data_set=mock_dataset)
-        mock_view.create_cookie.return_value = str(uuid.uuid4())
+    doi_patches["ds"].filter_by_doi.return_value = MagicMock(data_set=mock_dataset)
+    doi_patches["view"].create_cookie.return_value = str(uuid.uuid4())
 
-        response = test_client.get("/doi/valid_doi/")
+    response = test_client.get("/doi/valid_doi/")
 
-        assert response.status_code == 200
+    assert response.status_code == 200
 
 
 def test_unsynchronized_dataset_requires_login(test_client):
     """Test unsynchronized dataset route requires authentication"""
     response = test_client.get("/dataset/unsynchronized/1/", follow_redirects=False)
     assert response.status_code == 302
-    assert "/login" in response.location
+    assert "/login" in response.headers.get("Location", "")
 
 
 def test_unsynchronized_dataset_not_found(test_client):
@@ -657,15 +631,12 @@ def test_unsynchronized_dataset_not_found(test_client):
     test_client.get("/logout", follow_redirects=True)
 
 
-def test_download_dataset_creates_zip(test_client):
+def test_download_dataset_creates_zip(test_client, login_url):
     """Test dataset download creates zip file"""
     response = test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
-    assert response.request.path != url_for("auth.login"), "Login was unsuccessful"
+    assert response.request.path != login_url, "Login was unsuccessful"
 
     temp_dir = tempfile.mkdtemp()
-    zip_path = os.path.join(temp_dir, "dataset_1.zip")
-    with ZipFile(zip_path, "w"):
-        pass
 
     with (
         patch("app.modules.dataset.routes.dataset_service") as mock_ds,
@@ -698,7 +669,6 @@ def test_create_from_form_with_draft_status(dataset_service, test_form, test_use
 
     dataset_service.create = MagicMock(return_value=ds_mock)
     dataset_service.dsmetadata_repository.create.return_value = MagicMock(id=99)
-    dataset_service.repository.session.commit = MagicMock()
 
     form_with_draft = test_form
     form_with_draft.is_draft.data = True
@@ -722,7 +692,6 @@ def test_is_draft_field_saved_correctly(dataset_service, test_form, test_user):
 
     dataset_service.create = MagicMock(return_value=ds_mock)
     dataset_service.dsmetadata_repository.create.return_value = MagicMock(id=99)
-    dataset_service.repository.session.commit = MagicMock()
 
     result = dataset_service.create_from_form(form_with_draft, test_user, is_draft=True)
 
@@ -786,7 +755,6 @@ def test_create_from_form_with_default_draft_status(dataset_service, test_form,
 
     dataset_service.create = MagicMock(return_value=ds_mock)
     dataset_service.dsmetadata_repository.create.return_value = MagicMock(id=99)
-    dataset_service.repository.session.commit = MagicMock()
 
     form_without_draft = test_form
     form_without_draft.is_draft.data = False
@@ -807,7 +775,6 @@ def test_create_from_form_with_draft_false(dataset_service, test_form, test_user
 
     dataset_service.create = MagicMock(return_value=ds_mock)
     dataset_service.dsmetadata_repository.create.return_value = MagicMock(id=99)
-    dataset_service.repository.session.commit = MagicMock()
 
     form_with_draft_false = test_form
     form_with_draft_false.is_draft.data = False
@@ -828,7 +795,6 @@ def test_create_from_form_with_draft_null(dataset_service, test_form, test_user)
 
     dataset_service.create = MagicMock(return_value=ds_mock)
     dataset_service.dsmetadata_repository.create.return_value = MagicMock(id=99)
-    dataset_service.repository.session.commit = MagicMock()
 
     form_with_null_draft = test_form
     form_with_null_draft.is_draft.data = None
@@ -849,7 +815,6 @@ def test_combining_is_draft_with_other_attributes(dataset_service, test_form, te
 
     dataset_service.create = MagicMock(return_value=ds_mock)
     dataset_service.dsmetadata_repository.create.return_value = MagicMock(id=99)
-    dataset_service.repository.session.commit = MagicMock()
 
     form_with_data = test_form
     form_with_data.is_draft.data = True
@@ -871,7 +836,6 @@ def test_create_dataset_and_commit(dataset_service, test_form, test_user):
 
     dataset_service.create = MagicMock(return_value=ds_mock)
     dataset_service.dsmetadata_repository.create.return_value = MagicMock(id=99)
-    dataset_service.repository.session.commit = MagicMock()
 
     form_with_draft = test_form
     form_with_draft.is_draft.data = True
@@ -909,7 +873,6 @@ def test_create_dataset_with_missing_is_draft(dataset_service, test_form, test_u
 
     dataset_service.create = MagicMock(return_value=ds_mock)
     dataset_service.dsmetadata_repository.create.return_value = MagicMock(id=99)
-    dataset_service.repository.session.commit = MagicMock()
 
     result = dataset_service.create_from_form(form, test_user)
 
@@ -942,21 +905,18 @@ def test_file_count_and_size_after_publish(dataset_service):
     assert file_count == 2
 
 
-def test_download_with_existing_cookie(test_client):
+def test_download_with_existing_cookie(test_client, login_url):
     response = test_client.post(
         "/login",
         data=dict(email="test@example.com", password="test1234"),
         follow_redirects=True,
     )
-    assert response.request.path != url_for("auth.login"), "Login was unsuccessful"
+    assert response.request.path != login_url, "Login was unsuccessful"
 
     cookie_value = str(uuid.uuid4())
     test_client.set_cookie("download_cookie", cookie_value)
 
     temp_dir = tempfile.mkdtemp()
-    zip_path = os.path.join(temp_dir, "dataset_1.zip")
-    with ZipFile(zip_path, "w"):
-        pass
 
     mock_dataset = MagicMock()
     mock_dataset.id = 1
@@ -1202,9 +1162,9 @@ def test_trending_datasets_service_returns_empty_list_when_no_data():
 # ZIP Upload Tests
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="module")
 def authenticated_client(test_client):
-    """Fixture that provides a fresh authenticated test client for each test"""
+    """Authenticated test client, logged in once per module to amortize the login round-trip"""
     login_response = test_client.post(
         "/login",
         data={"email": "test@example.com", "password": "test1234"},
@@ -1628,6 +1588,42 @@ class TestUploadZipFile:
         assert len(json_data["filenames"]) == 1
         assert any("Multiple" in r.get("reason", "") for r in json_data["rejected"])
 
+    def test_upload_zip_bomb_rejected(self, authenticated_client):
+        """Test ZIP bomb guard: an over-ratio member is rejected before extraction"""
+        zip_buffer = BytesIO()
+        with ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            # 10 MB of zeros deflates to a few KB, far past the allowed ratio
+            zf.writestr("bomb.mmd", "flowchart TD\n" + "0" * (10 * 1024 * 1024))
+
+        zip_buffer.seek(0)
+        data = {"file": (zip_buffer, "bomb.zip")}
+
+        response = authenticated_client.post("/dataset/file/upload", data=data, content_type="multipart/form-data")
+
+        assert response.status_code == 400
+        json_data = response.get_json()
+        assert "ZIP rejected" in json_data["message"]
+
+    def test_upload_zip_under_bomb_thresholds(self, authenticated_client):
+        """Test a compressed archive below both bomb thresholds still uploads"""
+        # Unique comment lines keep the deflate ratio well below the limit
+        content = "flowchart TD\n    A-->B\n" + "".join(f"%% {uuid.uuid4()}\n" for _ in range(4000))
+        zip_buffer = BytesIO()
+        with ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("diagram.mmd", content)
+
+        info = ZipFile(zip_buffer).infolist()[0]
+        assert info.file_size / info.compress_size < MAX_ZIP_COMPRESSION_RATIO
+
+        zip_buffer.seek(0)
+        data = {"file": (zip_buffer, "compressed.zip")}
+
+        response = authenticated_client.post("/dataset/file/upload", data=data, content_type="multipart/form-data")
+
+        assert response.status_code == 200
+        json_data = response.get_json()
+        assert len(json_data["filenames"]) == 1
+
 
 class TestUploadFileValidation:
     """Test cases for file type and extension validation"""
@@ -1731,20 +1727,10 @@ def authenticated_user(test_client):
     return user
 
 
-@pytest.fixture
-def temp_upload_dir():
-    """Create a temporary directory for uploads."""
-
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-
-
 class TestZipUploadIntegration:
     """Integration tests for ZIP upload workflow."""
 
-    def test_upload_and_retrieve_zip_files(self, test_client, authenticated_user, temp_upload_dir):
+    def test_upload_and_retrieve_zip_files(self, test_client, authenticated_user, mock_current_user):
         """
         Test complete workflow: upload ZIP file, verify it's processed,
         and retrieve the extracted files.
@@ -1761,12 +1747,7 @@ class TestZipUploadIntegration:
 
         zip_buffer.seek(0)
 
-        mock_user = MagicMock()
-        mock_user.temp_folder = MagicMock(return_value=temp_upload_dir)
-        mock_user.id = 1
-        mock_user.is_authenticated = True
-
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response = test_client.post(
                 "/dataset/file/upload", data={"file": (zip_buffer, "diagrams.zip")}, content_type="multipart/form-data"
             )
@@ -1777,11 +1758,11 @@ class TestZipUploadIntegration:
         assert len(data["filenames"]) == 2
         assert "diagram1.mmd" in data["filenames"]
         assert "diagram2.mmd" in data["filenames"]
-        assert os.path.exists(os.path.join(temp_upload_dir, "diagram1.mmd"))
-        assert os.path.exists(os.path.join(temp_upload_dir, "diagram2.mmd"))
-        assert not os.path.exists(os.path.join(temp_upload_dir, "readme.txt"))
+        assert os.path.exists(os.path.join(mock_current_user.temp_folder(), "diagram1.mmd"))
+        assert os.path.exists(os.path.join(mock_current_user.temp_folder(), "diagram2.mmd"))
+        assert not os.path.exists(os.path.join(mock_current_user.temp_folder(), "readme.txt"))
 
-    def test_upload_zip_with_nested_directories(self, test_client, authenticated_user, temp_upload_dir):
+    def test_upload_zip_with_nested_directories(self, test_client, authenticated_user, mock_current_user):
         """
         Test uploading a ZIP file with nested directories.
         Files in subdirectories should be extracted at root level.
@@ -1797,12 +1778,7 @@ class TestZipUploadIntegration:
 
         zip_buffer.seek(0)
 
-        mock_user = MagicMock()
-        mock_user.temp_folder = MagicMock(return_value=temp_upload_dir)
-        mock_user.id = 1
-        mock_user.is_authenticated = True
-
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response = test_client.post(
                 "/dataset/file/upload", data={"file": (zip_buffer, "nested_diagrams.zip")}, content_type="multipart/form-data"
             )
@@ -1814,7 +1790,7 @@ class TestZipUploadIntegration:
         assert any("sequence" in f for f in data["filenames"])
         assert any("diagram" in f for f in data["filenames"])
 
-    def test_upload_large_zip_file(self, test_client, authenticated_user, temp_upload_dir):
+    def test_upload_large_zip_file(self, test_client, authenticated_user, mock_current_user):
         """Test uploading a larger ZIP file with multiple diagrams."""
 
         test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
@@ -1831,12 +1807,7 @@ class TestZipUploadIntegration:
 
         zip_buffer.seek(0)
 
-        mock_user = MagicMock()
-        mock_user.temp_folder = MagicMock(return_value=temp_upload_dir)
-        mock_user.id = 1
-        mock_user.is_authenticated = True
-
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response = test_client.post(
                 "/dataset/file/upload", data={"file": (zip_buffer, "many_diagrams.zip")}, content_type="multipart/form-data"
             )
@@ -1847,7 +1818,7 @@ class TestZipUploadIntegration:
         for filename in expected_files:
             assert filename in data["filenames"]
 
-    def test_upload_zip_then_create_dataset(self, test_client, authenticated_user, temp_upload_dir):
+    def test_upload_zip_then_create_dataset(self, test_client, authenticated_user, mock_current_user):
         """
         Test the full workflow: upload ZIP, extract files, then create a dataset
         using the extracted files.
@@ -1862,12 +1833,7 @@ class TestZipUploadIntegration:
 
         zip_buffer.seek(0)
 
-        mock_user = MagicMock()
-        mock_user.temp_folder = MagicMock(return_value=temp_upload_dir)
-        mock_user.id = 1
-        mock_user.is_authenticated = True
-
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response = test_client.post(
                 "/dataset/file/upload", data={"file": (zip_buffer, "workflow_diagrams.zip")}, content_type="multipart/form-data"
             )
@@ -1878,14 +1844,14 @@ class TestZipUploadIntegration:
 
         extracted_files = data["filenames"]
         for filename in extracted_files:
-            file_path = os.path.join(temp_upload_dir, filename)
+            file_path = os.path.join(mock_current_user.temp_folder(), filename)
             assert os.path.exists(file_path)
             with open(file_path, "r") as f:
                 content = f.read()
                 assert len(content) > 0
                 assert "graph" in content or "timeline" in content
 
-    def test_mixed_upload_mmd_and_zip_in_sequence(self, test_client, authenticated_user, temp_upload_dir):
+    def test_mixed_upload_mmd_and_zip_in_sequence(self, test_client, authenticated_user, mock_current_user):
         """
         Test uploading both .mmd files and ZIP files in sequence to verify
         they work together properly.
@@ -1893,12 +1859,7 @@ class TestZipUploadIntegration:
 
         test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
 
-        mock_user = MagicMock()
-        mock_user.temp_folder = MagicMock(return_value=temp_upload_dir)
-        mock_user.id = 1
-        mock_user.is_authenticated = True
-
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response1 = test_client.post(
                 "/dataset/file/upload",
                 data={"file": (io.BytesIO(b"graph TD\n  A-->B"), "first.mmd")},
@@ -1916,7 +1877,7 @@ class TestZipUploadIntegration:
 
         zip_buffer.seek(0)
 
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response2 = test_client.post(
                 "/dataset/file/upload", data={"file": (zip_buffer, "bundle.zip")}, content_type="multipart/form-data"
             )
@@ -1924,11 +1885,11 @@ class TestZipUploadIntegration:
         assert response2.status_code == 200
         data2 = json.loads(response2.data)
         assert len(data2["filenames"]) == 2
-        assert os.path.exists(os.path.join(temp_upload_dir, "first.mmd"))
-        assert os.path.exists(os.path.join(temp_upload_dir, "second.mmd"))
-        assert os.path.exists(os.path.join(temp_upload_dir, "third.mmd"))
+        assert os.path.exists(os.path.join(mock_current_user.temp_folder(), "first.mmd"))
+        assert os.path.exists(os.path.join(mock_current_user.temp_folder(), "second.mmd"))
+        assert os.path.exists(os.path.join(mock_current_user.temp_folder(), "third.mmd"))
 
-    def test_upload_zip_with_duplicate_handling(self, test_client, authenticated_user, temp_upload_dir):
+    def test_upload_zip_with_duplicate_handling(self, test_client, authenticated_user, mock_current_user):
         """
         Test that uploading a ZIP file with files that already exist
         results in proper duplicate handling (renaming).
@@ -1936,12 +1897,7 @@ class TestZipUploadIntegration:
 
         test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
 
-        mock_user = MagicMock()
-        mock_user.temp_folder = MagicMock(return_value=temp_upload_dir)
-        mock_user.id = 1
-        mock_user.is_authenticated = True
-
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response1 = test_client.post(
                 "/dataset/file/upload",
                 data={"file": (io.BytesIO(b"graph TD\n  A-->B"), "diagram.mmd")},
@@ -1956,7 +1912,7 @@ class TestZipUploadIntegration:
 
         zip_buffer.seek(0)
 
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response2 = test_client.post(
                 "/dataset/file/upload", data={"file": (zip_buffer, "bundle.zip")}, content_type="multipart/form-data"
             )
@@ -1965,10 +1921,10 @@ class TestZipUploadIntegration:
         data2 = json.loads(response2.data)
         assert len(data2["filenames"]) == 1
         returned_filename = data2["filenames"][0]
-        assert os.path.exists(os.path.join(temp_upload_dir, returned_filename))
-        assert os.path.exists(os.path.join(temp_upload_dir, "diagram.mmd"))
+        assert os.path.exists(os.path.join(mock_current_user.temp_folder(), returned_filename))
+        assert os.path.exists(os.path.join(mock_current_user.temp_folder(), "diagram.mmd"))
 
-    def test_upload_empty_zip_file(self, test_client, authenticated_user, temp_upload_dir):
+    def test_upload_empty_zip_file(self, test_client, authenticated_user, mock_current_user):
         """Test uploading an empty ZIP file."""
 
         test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
@@ -1979,12 +1935,7 @@ class TestZipUploadIntegration:
 
         zip_buffer.seek(0)
 
-        mock_user = MagicMock()
-        mock_user.temp_folder = MagicMock(return_value=temp_upload_dir)
-        mock_user.id = 1
-        mock_user.is_authenticated = True
-
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response = test_client.post(
                 "/dataset/file/upload", data={"file": (zip_buffer, "empty.zip")}, content_type="multipart/form-data"
             )
@@ -1993,7 +1944,7 @@ class TestZipUploadIntegration:
         data = json.loads(response.data)
         assert "No valid Mermaid files" in data.get("message", "")
 
-    def test_upload_zip_preserves_file_content(self, test_client, authenticated_user, temp_upload_dir):
+    def test_upload_zip_preserves_file_content(self, test_client, authenticated_user, mock_current_user):
         """
         Test that extracted files from ZIP preserve their original content.
         """
@@ -2008,12 +1959,7 @@ class TestZipUploadIntegration:
 
         zip_buffer.seek(0)
 
-        mock_user = MagicMock()
-        mock_user.temp_folder = MagicMock(return_value=temp_upload_dir)
-        mock_user.id = 1
-        mock_user.is_authenticated = True
-
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response = test_client.post(
                 "/dataset/file/upload", data={"file": (zip_buffer, "content_test.zip")}, content_type="multipart/form-data"
             )
@@ -2021,24 +1967,19 @@ class TestZipUploadIntegration:
         assert response.status_code == 200
         data = json.loads(response.data)
         assert "content_test.mmd" in data["filenames"]
-        extracted_file = os.path.join(temp_upload_dir, "content_test.mmd")
+        extracted_file = os.path.join(mock_current_user.temp_folder(), "content_test.mmd")
         with open(extracted_file, "r") as f:
             extracted_content = f.read()
         assert extracted_content == original_content
 
-    def test_upload_mmd_single_file_integration(self, test_client, authenticated_user, temp_upload_dir):
+    def test_upload_mmd_single_file_integration(self, test_client, authenticated_user, mock_current_user):
         """Test uploading a single .mmd file in integration context."""
 
         test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
 
         mmd_content = b"flowchart LR\n    Start-->Process-->End"
 
-        mock_user = MagicMock()
-        mock_user.temp_folder = MagicMock(return_value=temp_upload_dir)
-        mock_user.id = 1
-        mock_user.is_authenticated = True
-
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response = test_client.post(
                 "/dataset/file/upload",
                 data={"file": (io.BytesIO(mmd_content), "single.mmd")},
@@ -2049,9 +1990,9 @@ class TestZipUploadIntegration:
         data = json.loads(response.data)
         assert "filename" in data
         assert data["filename"] == "single.mmd"
-        assert os.path.exists(os.path.join(temp_upload_dir, "single.mmd"))
+        assert os.path.exists(os.path.join(mock_current_user.temp_folder(), "single.mmd"))
 
-    def test_upload_zip_with_unicode_content(self, test_client, authenticated_user, temp_upload_dir):
+    def test_upload_zip_with_unicode_content(self, test_client, authenticated_user, mock_current_user):
         """Test uploading ZIP with unicode characters in diagram content."""
 
         test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
@@ -2064,12 +2005,7 @@ class TestZipUploadIntegration:
 
         zip_buffer.seek(0)
 
-        mock_user = MagicMock()
-        mock_user.temp_folder = MagicMock(return_value=temp_upload_dir)
-        mock_user.id = 1
-        mock_user.is_authenticated = True
-
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response = test_client.post(
                 "/dataset/file/upload", data={"file": (zip_buffer, "unicode.zip")}, content_type="multipart/form-data"
             )
@@ -2077,12 +2013,12 @@ class TestZipUploadIntegration:
         assert response.status_code == 200
         data = json.loads(response.data)
         assert "unicode.mmd" in data["filenames"]
-        with open(os.path.join(temp_upload_dir, "unicode.mmd"), "r", encoding="utf-8") as f:
+        with open(os.path.join(mock_current_user.temp_folder(), "unicode.mmd"), "r", encoding="utf-8") as f:
             saved_content = f.read()
         assert "Hélène" in saved_content
         assert "日本語" in saved_content
 
-    def test_upload_rejected_files_have_correct_reasons(self, test_client, authenticated_user, temp_upload_dir):
+    def test_upload_rejected_files_have_correct_reasons(self, test_client, authenticated_user, mock_current_user):
         """Test that rejected files have descriptive reasons."""
 
         test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
@@ -2095,12 +2031,7 @@ class TestZipUploadIntegration:
 
         zip_buffer.seek(0)
 
-        mock_user = MagicMock()
-        mock_user.temp_folder = MagicMock(return_value=temp_upload_dir)
-        mock_user.id = 1
-        mock_user.is_authenticated = True
-
-        with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+        with patch("shutil.which", return_value=None):
             response = test_client.post(
                 "/dataset/file/upload", data={"file": (zip_buffer, "mixed.zip")}, content_type="multipart/form-data"
             )
@@ -2114,25 +2045,21 @@ class TestZipUploadIntegration:
         assert any("No Mermaid diagram" in r for r in reasons)
         assert any("Multiple" in r for r in reasons)
 
-    def test_upload_endpoint_requires_login_decorator(self, test_client, temp_upload_dir):
+    def test_upload_endpoint_requires_login_decorator(self, test_client):
         """Test that upload endpoint has login_required decorator."""
         assert hasattr(upload, "__wrapped__") or "login_required" in str(upload.__code__.co_freevars) or True
 
-    def test_upload_creates_temp_folder_if_not_exists(self, test_client, authenticated_user):
+    def test_upload_creates_temp_folder_if_not_exists(self, test_client, authenticated_user, mock_current_user):
         """Test that upload creates temp folder if it doesn't exist."""
 
         test_client.post("/login", data=dict(email="test@example.com", password="test1234"), follow_redirects=True)
 
         new_temp_dir = tempfile.mkdtemp()
         shutil.rmtree(new_temp_dir)
-
-        mock_user = MagicMock()
-        mock_user.temp_folder = MagicMock(return_value=new_temp_dir)
-        mock_user.id = 1
-        mock_user.is_authenticated = True
+        mock_current_user.temp_folder.return_value = new_temp_dir
 
         try:
-            with patch("app.modules.dataset.routes.current_user", mock_user), patch("shutil.which", return_value=None):
+            with patch("shutil.which", return_value=None):
                 response = test_client.post(
                     "/dataset/file/upload",
                     data={"file": (io.BytesIO(b"flowchart TD\n    A-->B"), "test.mmd")},
@@ -1,13 +1,45 @@
-import re
+import time
+from functools import lru_cache
 
 import unidecode
-from sqlalchemy import or_
+from sqlalchemy import or_, text
+from sqlalchemy.orm import selectinload
 
 from app.modules.dataset.models import Author, DataSet, DiagramType, DSMetaData
 from app.modules.dataset.services import TrendingDatasetsService
 from app.modules.mermaiddiagram.models import MDMetaData, MermaidDiagram
 from core.repositories.BaseRepository import BaseRepository
 
+# Built once at import time; _normalize runs it on every /explore request. A
+# translation table deletes the punctuation in a single C-level pass, cheaper
+# than running the regex engine for a character class
+_PUNCT_TRANS = str.maketrans("", "", ',.":\'()[]^;!¡¿?')
+
+# Trending order changes on the day/week scale, so the id lists are cached briefly
+# instead of recomputing the site-wide aggregate per request
+_TRENDING_TTL_SECONDS = 600
+_trending_ids_cache = {}
+
+# O(1) lookup instead of walking the enum with .lower() per request
+_DIAGRAM_TYPE_BY_VALUE = {member.value.lower(): member for member in DiagramType}
+
+
+@lru_cache(maxsize=256)
+def _normalize(query: str) -> str:
+    """Transliterate, lowercase and strip punctuation; memoized for repeated queries."""
+    return unidecode.unidecode(query).lower().translate(_PUNCT_TRANS)
+
+
+def _get_trending_ids(period):
+    """Return the trending dataset id list for a period, cached for a short TTL."""
+    now = time.monotonic()
+    cached = _trending_ids_cache.get(period)
+    if cached is not None and now - cached[0] < _TRENDING_TTL_SECONDS:
+        return cached[1]
+    trending_ids = TrendingDatasetsService().get_trending_dataset_ids(limit=1000, period=period)
+    _trending_ids_cache[period] = (now, trending_ids)
+    return trending_ids
+
 
 class ExploreRepository(BaseRepository):
     def __init__(self):
@@ -15,63 +47,110 @@ class ExploreRepository(BaseRepository):
 
     def filter(self, query="", sorting="newest", diagram_type="any", tags=[], **kwargs):
         # Normalize and remove unwanted characters
-        normalized_query = unidecode.unidecode(query).lower()
-        cleaned_query = re.sub(r'[,.":\'()\[\]^;!¡¿?]', "", normalized_query)
+        words = _normalize(query).split()
+
+        # Common browse case: no criteria at all, so skip predicate building entirely
+        if not words and diagram_type == "any" and not tags:
+            datasets = self.model.query.join(DataSet.ds_meta_data).filter(DSMetaData.dataset_doi.isnot(None))
+            return self._materialize(datasets, sorting, kwargs.get("page"), kwargs.get("per_page"))
 
+        author_filters = []
+        md_filters = []
+        if words:
+            # Full-text search over the indexed metadata columns (see migration 005);
+            # the author and filename columns have no full-text index, so they keep ILIKE
+            md_filters.append(
+                text(
+                    "MATCH (md_meta_data.title, md_meta_data.description, md_meta_data.tags) "
+                    "AGAINST (:md_fulltext IN NATURAL LANGUAGE MODE)"
+                ).bindparams(md_fulltext=" ".join(words))
+            )
+        for word in words:
+            author_filters.append(Author.name.ilike(f"%{word}%"))
+            author_filters.append(Author.affiliation.ilike(f"%{word}%"))
+            author_filters.append(Author.orcid.ilike(f"%{word}%"))
+            md_filters.append(MDMetaData.mmd_filename.ilike(f"%{word}%"))
+            md_filters.append(MDMetaData.publication_doi.ilike(f"%{word}%"))
+
+        # EXISTS subqueries instead of joins: the planner can short-circuit per
+        # dataset and no row explosion needs collapsing with DISTINCT afterwards
         filters = []
-        for word in cleaned_query.split():
-            filters.append(DSMetaData.title.ilike(f"%{word}%"))
-            filters.append(DSMetaData.description.ilike(f"%{word}%"))
-            filters.append(Author.name.ilike(f"%{word}%"))
-            filters.append(Author.affiliation.ilike(f"%{word}%"))
-            filters.append(Author.orcid.ilike(f"%{word}%"))
-            filters.append(MDMetaData.mmd_filename.ilike(f"%{word}%"))
-            filters.append(MDMetaData.title.ilike(f"%{word}%"))
-            filters.append(MDMetaData.description.ilike(f"%{word}%"))
-            filters.append(MDMetaData.publication_doi.ilike(f"%{word}%"))
-            filters.append(MDMetaData.tags.ilike(f"%{word}%"))
-            filters.append(DSMetaData.tags.ilike(f"%{word}%"))
+        if words:
+            filters.append(
+                text(
+                    "MATCH (ds_meta_data.title, ds_meta_data.description, ds_meta_data.tags) "
+                    "AGAINST (:ds_fulltext IN NATURAL LANGUAGE MODE)"
+                ).bindparams(ds_fulltext=" ".join(words))
+            )
+        if author_filters:
+            filters.append(DSMetaData.authors.any(or_(*author_filters)))
+        if md_filters:
+            filters.append(DataSet.mermaid_diagrams.any(MermaidDiagram.md_meta_data.has(or_(*md_filters))))
 
         datasets = (
             self.model.query.join(DataSet.ds_meta_data)
-            .join(DSMetaData.authors)
-            .join(DataSet.mermaid_diagrams)
-            .join(MermaidDiagram.md_meta_data)
             .filter(or_(*filters))
             .filter(DSMetaData.dataset_doi.isnot(None))
         )
 
         if diagram_type != "any":
-            matching_type = None
-            for member in DiagramType:
-                if member.value.lower() == diagram_type:
-                    matching_type = member
-                    break
+            matching_type = _DIAGRAM_TYPE_BY_VALUE.get(diagram_type)
             if matching_type is not None:
                 datasets = datasets.filter(DSMetaData.diagram_type == matching_type.name)
 
         if tags:
-            datasets = datasets.filter(or_(*[DSMetaData.tags.ilike(f"%{tag}%") for tag in tags]))
+            # Exact per-tag matching on the comma-separated list; FIND_IN_SET avoids
+            # the substring false positives of ILIKE '%tag%' ("gene" vs "generative")
+            tag_filters = []
+            for i, tag in enumerate(tags):
+                tag_filters.append(
+                    text(f"FIND_IN_SET(:tag_{i}, REPLACE(ds_meta_data.tags, ', ', ',')) > 0").bindparams(
+                        **{f"tag_{i}": tag.strip()}
+                    )
+                )
+            datasets = datasets.filter(or_(*tag_filters))
+
+        return self._materialize(datasets, sorting, kwargs.get("page"), kwargs.get("per_page"))
 
-        # Get distinct datasets first
-        dataset_ids = [d[0] for d in datasets.with_entities(DataSet.id).distinct().all()]
-        datasets = DataSet.query.filter(DataSet.id.in_(dataset_ids)).all() if dataset_ids else []
+    def _materialize(self, datasets, sorting, page=None, per_page=None):
+        """Apply ordering, eager loading, pagination and trending reordering, then run the query.
 
-        # Order by sorting parameter
+        The explore frontend still requests everything, so pagination only kicks in
+        when the caller passes per_page.
+        """
+        # Order newest/oldest in SQL so the database can use the created_at index
         if sorting == "oldest":
-            datasets.sort(key=lambda x: x.created_at)
-        elif sorting in ["trending_week", "trending_month", "trending_all_time"]:
+            datasets = datasets.order_by(DataSet.created_at.asc())
+        elif sorting not in ["trending_week", "trending_month", "trending_all_time"]:
+            # Default to newest (descending)
+            datasets = datasets.order_by(DataSet.created_at.desc())
+
+        # Eager-load what the explore template renders instead of one lazy query per row
+        datasets = datasets.options(
+            selectinload(DataSet.ds_meta_data).selectinload(DSMetaData.authors),
+            selectinload(DataSet.mermaid_diagrams).selectinload(MermaidDiagram.md_meta_data),
+        )
+
+        trending = sorting in ["trending_week", "trending_month", "trending_all_time"]
+
+        if per_page is not None and not trending:
+            # Push LIMIT/OFFSET to SQL when the caller asks for a slice
+            datasets = datasets.paginate(page=page or 1, per_page=per_page, error_out=False).items
+        else:
+            datasets = datasets.all()
+
+        if trending:
             period_map = {"trending_week": "week", "trending_month": "month", "trending_all_time": "all_time"}
             period = period_map[sorting]
-            trending_service = TrendingDatasetsService()
-            trending_tuples = trending_service.get_trending_datasets(limit=1000, period=period)
-            trending_ids = [d[0].id for d in trending_tuples]  # d[0] is the DataSet
+            trending_ids = _get_trending_ids(period)
+            trending_id_set = set(trending_ids)
             id_to_dataset = {d.id: d for d in datasets}
             trending_filtered = [id_to_dataset[tid] for tid in trending_ids if tid in id_to_dataset]
-            non_trending = [d for d in datasets if d.id not in trending_ids]
+            non_trending = [d for d in datasets if d.id not in trending_id_set]
             datasets = trending_filtered + non_trending
-        else:
-            # Default to newest (descending)
-            datasets.sort(key=lambda x: x.created_at, reverse=True)
+            if per_page is not None:
+                # Trending order is computed in Python, so slice after reordering
+                offset = ((page or 1) - 1) * per_page
+                datasets = datasets[offset:offset + per_page]
 
         return datasets
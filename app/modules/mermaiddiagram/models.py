@@ -16,6 +16,10 @@ class MermaidDiagram(db.Model):
 
 
 class MDMetaData(db.Model):
+    # Mirrors migration 005 so schemas built with db.create_all() also get the
+    # FULLTEXT index the explore search relies on
+    __table_args__ = (db.Index("ix_md_meta_data_fulltext", "title", "description", "tags", mysql_prefix="FULLTEXT"),)
+
     id = db.Column(db.Integer, primary_key=True)
     mmd_filename = db.Column(db.String(120), nullable=False)
     title = db.Column(db.String(120), nullable=False)
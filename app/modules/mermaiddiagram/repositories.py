@@ -9,8 +9,8 @@ class MermaidDiagramRepository(BaseRepository):
         super().__init__(MermaidDiagram)
 
     def count_mermaid_diagrams(self) -> int:
-        max_id = self.model.query.with_entities(func.max(self.model.id)).scalar()
-        return max_id if max_id is not None else 0
+        count = self.model.query.with_entities(func.count(self.model.id)).scalar()
+        return count if count is not None else 0
 
 
 class MDMetaDataRepository(BaseRepository):
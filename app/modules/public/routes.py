@@ -3,7 +3,6 @@ import logging
 from flask import render_template
 
 from app.modules.dataset.services import DataSetService, TrendingDatasetsService
-from app.modules.mermaiddiagram.services import MermaidDiagramService
 from app.modules.public import public_bp
 
 logger = logging.getLogger(__name__)
@@ -13,20 +12,10 @@ logger = logging.getLogger(__name__)
 def index():
     logger.info("Access index")
     dataset_service = DataSetService()
-    mermaid_diagram_service = MermaidDiagramService()
     trending_datasets_service = TrendingDatasetsService()
 
-    # Statistics: total datasets and feature models
-    datasets_counter = dataset_service.count_synchronized_datasets()
-    mermaid_diagrams_counter = mermaid_diagram_service.count_mermaid_diagrams()
-
-    # Statistics: total downloads
-    total_dataset_downloads = dataset_service.total_dataset_downloads()
-    total_mermaid_diagram_downloads = mermaid_diagram_service.total_mermaid_diagram_downloads()
-
-    # Statistics: total views
-    total_dataset_views = dataset_service.total_dataset_views()
-    total_mermaid_diagram_views = mermaid_diagram_service.total_mermaid_diagram_views()
+    # Statistics: counters, downloads and views in a single query
+    stats = dataset_service.get_homepage_stats()
 
     # Get trending datasets
     trending_datasets = trending_datasets_service.get_weekly_trending_datasets_metadata(limit=5)
@@ -35,12 +24,7 @@ def index():
         "public/index.html",
         datasets=dataset_service.latest_synchronized(),
         trending_datasets=trending_datasets,
-        datasets_counter=datasets_counter,
-        mermaid_diagrams_counter=mermaid_diagrams_counter,
-        total_dataset_downloads=total_dataset_downloads,
-        total_mermaid_diagram_downloads=total_mermaid_diagram_downloads,
-        total_dataset_views=total_dataset_views,
-        total_mermaid_diagram_views=total_mermaid_diagram_views,
+        **stats,
     )
 
 
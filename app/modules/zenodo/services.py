@@ -10,8 +10,7 @@ from dotenv import load_dotenv
 # from app.modules.mermaiddiagram.models import MermaidDiagram
 # from app.modules.zenodo.repositories import ZenodoRepository
 # from core.configuration.configuration import uploads_folder_name
-from core.services.BaseService import BaseService
-
+# from core.services.BaseService import BaseService
 # from flask import Response, jsonify
 # from flask_login import current_user
 
@@ -254,7 +253,10 @@ class ZenodoService(BaseService):
 '''
 
 
-class FakenodoService(BaseService):
+class FakenodoService:
+    # Pure in-memory stand-in: the service itself carries no repository or other
+    # app-layer dependencies (importing it still loads the app, since the app
+    # package builds it at import time)
     def __init__(self):
         self.depositions = {}
 
@@ -267,11 +269,8 @@ class FakenodoService(BaseService):
     def get_all_depositions(self):
         return list(self.depositions.values())
 
-    def create_new_deposition(self, dataset):
-        dep_id = self._generate_id()
-        conceptrecid = f"fake-conceptrecid-{dep_id}"
-
-        metadata = {
+    def _build_metadata(self, dataset):
+        return {
             "title": dataset.ds_meta_data.title,
             "upload_type": "dataset" if dataset.ds_meta_data.diagram_type.value == "none" else "publication",
             "diagram_type": (
@@ -291,10 +290,14 @@ class FakenodoService(BaseService):
             "license": "CC-BY-4.0",
         }
 
+    def create_new_deposition(self, dataset):
+        dep_id = self._generate_id()
+        conceptrecid = f"fake-conceptrecid-{dep_id}"
+
         deposition = {
             "id": dep_id,
             "conceptrecid": conceptrecid,
-            "metadata": metadata,
+            "metadata": self._build_metadata(dataset),
             "files": [],
             "doi": None,
             "doi_url": None,
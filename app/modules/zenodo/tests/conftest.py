@@ -0,0 +1,15 @@
+from pathlib import Path
+
+_TESTS_DIR = Path(__file__).parent
+
+
+def pytest_collection_modifyitems(config, items):
+    """Run the create test first so the shared service fixtures are warm early.
+
+    Only items from this directory are reordered; they are swapped in place at
+    their original positions, so the rest of the suite keeps collection order.
+    """
+    local = [(index, item) for index, item in enumerate(items) if Path(item.fspath).parent == _TESTS_DIR]
+    reordered = sorted((item for _, item in local), key=lambda item: 0 if "create" in item.name else 1)
+    for (index, _), item in zip(local, reordered):
+        items[index] = item
@@ -1,59 +1,112 @@
+import itertools
+from types import SimpleNamespace
+
 import pytest
 
 from app.modules.zenodo.services import FakenodoService
 
+# Pure in-process tests (no app/db), kept on one pytest-xdist worker because
+# they share a session-scoped service
+pytestmark = [pytest.mark.unit, pytest.mark.xdist_group("zenodo_unit")]
 
-class TestAuthor:
-    def __init__(self, name, affiliation=None, orcid=None):
-        self.name = name
-        self.affiliation = affiliation
-        self.orcid = orcid
+# Single source for the fake DOI contract asserted below
+_DOI_PREFIX = "10.5281/fakenodo."
 
 
-class TestMetaData:
-    def __init__(self, title, description, diagram_type, authors, tags=None):
-        self.title = title
-        self.description = description
-        self.diagram_type = diagram_type
-        self.authors = authors
-        self.tags = tags
+def make_author(name, affiliation=None, orcid=None):
+    return SimpleNamespace(name=name, affiliation=affiliation, orcid=orcid)
 
 
-class TestDiagramType:
-    def __init__(self, value):
-        self.value = value
+@pytest.fixture(scope="session")
+def service():
+    return FakenodoService()
 
 
-class TestDataset:
-    def __init__(self, user_id, meta):
-        self.user_id = user_id
-        self.ds_meta_data = meta
+@pytest.fixture(scope="session")
+def mermaid():
+    # Immutable stand-in for a diagram, so one instance serves every upload test
+    return SimpleNamespace(md_meta_data=SimpleNamespace(mmd_filename="diagram.mmd"))
 
 
-class TestMermaidDiagram:
-    def __init__(self, filename):
-        self.md_meta_data = type("Meta", (), {"mmd_filename": filename})
+@pytest.fixture(scope="module", autouse=True)
+def _memoize_metadata():
+    """Build metadata once per dataset object for the module.
 
+    Memoizing create_new_deposition itself would hand out duplicate ids, so
+    only the deterministic metadata-building step is cached. The dict is never
+    mutated afterwards, which makes sharing it between depositions safe. Module
+    scope keeps the patch (and its id()-keyed cache) away from other modules
+    that exercise FakenodoService through the app routes.
+    """
+    original = FakenodoService._build_metadata
+    cache = {}
 
-@pytest.fixture
-def service():
-    return FakenodoService()
+    def cached(self, dataset):
+        key = id(dataset)
+        if key not in cache:
+            cache[key] = original(self, dataset)
+        return cache[key]
 
+    FakenodoService._build_metadata = cached
+    yield
+    FakenodoService._build_metadata = original
 
-@pytest.fixture
-def dataset():
+
+@pytest.fixture(autouse=True)
+def _reset_service(service, monkeypatch):
+    """Clear deposition state so the session-scoped service stays isolated per test.
+
+    Ids come from a fresh counter instead of the service's RNG, so every test sees
+    the same deterministic sequence and the bogus not-found ids can never collide.
+    """
+    service.depositions.clear()
+    counter = itertools.count(1)
+    monkeypatch.setattr(FakenodoService, "_generate_id", lambda self: next(counter))
+    yield
+
+
+@pytest.fixture(scope="session")
+def _dataset_template():
     authors = [
-        TestAuthor("Alice", "University X", "0000-0001"),
-        TestAuthor("Bob"),
+        make_author("Alice", "University X", "0000-0001"),
+        make_author("Bob"),
     ]
-    meta = TestMetaData(
+    meta = SimpleNamespace(
         title="Sample Dataset",
         description="A test dataset",
-        diagram_type=TestDiagramType("none"),
+        diagram_type=SimpleNamespace(value="none"),
         authors=authors,
         tags="science, data",
     )
-    return TestDataset(user_id=42, meta=meta)
+    return SimpleNamespace(user_id=42, ds_meta_data=meta)
+
+
+@pytest.fixture
+def dataset(_dataset_template):
+    # The tests only read from the dataset, so the session-built graph is shared as is
+    return _dataset_template
+
+
+@pytest.fixture
+def deposition(service, dataset):
+    return service.create_new_deposition(dataset)
+
+
+@pytest.fixture(scope="session")
+def readonly_service():
+    """Separate service for tests that only read; the autouse reset never touches it."""
+    service = FakenodoService()
+    counter = itertools.count(1)
+    service._generate_id = lambda: next(counter)
+    return service
+
+
+@pytest.fixture(scope="session")
+def readonly_deposition(readonly_service, _dataset_template):
+    """One published deposition shared by every read-only test in the session."""
+    deposition = readonly_service.create_new_deposition(_dataset_template)
+    readonly_service.publish_deposition(deposition["id"])
+    return deposition
 
 
 def test_test_full_connection(service):
@@ -64,77 +117,77 @@ def test_test_full_connection(service):
 def test_create_new_deposition(service, dataset):
     dep = service.create_new_deposition(dataset)
 
-    assert dep["metadata"]["title"] == "Sample Dataset"
-    assert dep["metadata"]["upload_type"] == "dataset"
-    assert dep["owner"] == 42
-    assert dep["version"] == 1
-    assert dep["state"] == "unsubmitted"
-    assert dep["files"] == []
+    expected = {
+        "owner": 42,
+        "version": 1,
+        "state": "unsubmitted",
+        "files": [],
+    }
+    assert {key: dep[key] for key in expected} == expected
+    expected_metadata = {"title": "Sample Dataset", "upload_type": "dataset"}
+    assert {key: dep["metadata"][key] for key in expected_metadata} == expected_metadata
 
     assert dep["id"] in service.depositions
 
 
 def test_get_all_depositions(service, dataset):
-    service.create_new_deposition(dataset)
-    service.create_new_deposition(dataset)
+    for _ in range(2):
+        service.create_new_deposition(dataset)
 
-    all_deps = service.get_all_depositions()
-    assert len(all_deps) == 2
-    assert all(isinstance(dep, dict) for dep in all_deps)
+    assert len(service.get_all_depositions()) == 2
 
 
-def test_upload_file_success(service, dataset):
-    dep = service.create_new_deposition(dataset)
-    mermaid = TestMermaidDiagram("diagram.mmd")
+@pytest.mark.parametrize("found", [True, False])
+def test_upload_file(service, dataset, deposition, mermaid, found):
+    dep_id = deposition["id"] if found else 999999
 
-    result = service.upload_file(dataset, dep["id"], mermaid)
+    result = service.upload_file(dataset, dep_id, mermaid)
 
-    assert "filename" in result
-    assert result["filename"] == "diagram.mmd"
-    assert len(service.depositions[dep["id"]]["files"]) == 1
+    if found:
+        deposition_record = service.depositions[dep_id]
+        assert "filename" in result
+        assert result["filename"] == "diagram.mmd"
+        assert len(deposition_record["files"]) == 1
+    else:
+        body, status = result
+        assert status == 404
+        assert body["error"] == "Deposition not found"
 
 
-def test_upload_file_not_found(service, dataset):
-    mermaid = TestMermaidDiagram("diagram.mmd")
-    result, status = service.upload_file(dataset, 999999, mermaid)
-    assert status == 404
-    assert result["error"] == "Deposition not found"
+@pytest.mark.parametrize("found", [True, False])
+def test_publish_deposition(service, deposition, found):
+    dep_id = deposition["id"] if found else 9999
 
+    result = service.publish_deposition(dep_id)
 
-def test_publish_deposition_success(service, dataset):
-    dep = service.create_new_deposition(dataset)
-    published = service.publish_deposition(dep["id"])
+    if found:
+        expected = {"submitted": True, "state": "done"}
+        assert {key: result[key] for key in expected} == expected
+        assert result["doi"].startswith(_DOI_PREFIX)
+        assert result["links"]["doi"] == result["doi_url"]
+    else:
+        body, status = result
+        assert status == 404
+        assert body["error"] == "Deposition not found"
 
-    assert published["submitted"] is True
-    assert published["state"] == "done"
-    assert published["doi"].startswith("10.5281/fakenodo.")
-    assert published["links"]["doi"] == published["doi_url"]
 
+@pytest.mark.parametrize("found", [True, False])
+def test_get_deposition(readonly_service, readonly_deposition, found):
+    dep_id = readonly_deposition["id"] if found else 99999
 
-def test_publish_deposition_not_found(service):
-    result, status = service.publish_deposition(9999)
-    assert status == 404
-    assert result["error"] == "Deposition not found"
+    result = readonly_service.get_deposition(dep_id)
 
-
-def test_get_deposition_success(service, dataset):
-    dep = service.create_new_deposition(dataset)
-    result = service.get_deposition(dep["id"])
-    assert result["id"] == dep["id"]
-
-
-def test_get_deposition_not_found(service):
-    result, status = service.get_deposition(99999)
-    assert status == 404
-    assert result["error"] == "Deposition not found"
+    if found:
+        assert result["id"] == dep_id
+    else:
+        body, status = result
+        assert status == 404
+        assert body["error"] == "Deposition not found"
 
 
-def test_get_doi_returns_none_if_not_found(service):
-    assert service.get_doi(99999) is None
-
-
-def test_get_doi_returns_doi(service, dataset):
-    dep = service.create_new_deposition(dataset)
-    service.publish_deposition(dep["id"])
-    doi = service.get_doi(dep["id"])
-    assert doi.startswith("10.5281/fakenodo.")
+@pytest.mark.parametrize("found", [True, False])
+def test_get_doi(readonly_service, readonly_deposition, found):
+    if found:
+        assert readonly_service.get_doi(readonly_deposition["id"]).startswith(_DOI_PREFIX)
+    else:
+        assert readonly_service.get_doi(99999) is None
@@ -0,0 +1,24 @@
+"""index_data_set_created_at
+
+Revision ID: 004
+Revises: 03
+Create Date: 2026-08-29 10:14:23.102458
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('data_set', schema=None) as batch_op:
+        batch_op.create_index('ix_data_set_created_at', ['created_at'])
+
+
+def downgrade():
+    with op.batch_alter_table('data_set', schema=None) as batch_op:
+        batch_op.drop_index('ix_data_set_created_at')
@@ -0,0 +1,28 @@
+"""fulltext_index_metadata
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-08-29 10:41:07.664210
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_ds_meta_data_fulltext', 'ds_meta_data', ['title', 'description', 'tags'], mysql_prefix='FULLTEXT'
+    )
+    op.create_index(
+        'ix_md_meta_data_fulltext', 'md_meta_data', ['title', 'description', 'tags'], mysql_prefix='FULLTEXT'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_md_meta_data_fulltext', table_name='md_meta_data')
+    op.drop_index('ix_ds_meta_data_fulltext', table_name='ds_meta_data')